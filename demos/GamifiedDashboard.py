@@ -4,6 +4,10 @@ import cv2
 import numpy as np
 import time
 import sys
+import html
+import io
+import threading
+from queue import Queue, Empty
 from pathlib import Path
 from datetime import datetime
 
@@ -13,6 +17,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 # Import internal modules
 from modules.ArmRaise import ArmRaiseExercise
 from modules.ExerciseAnalytics import ExerciseAnalytics
+from modules.PoseModule import PoseDetector, capture_latest
 
 
 # ---------- Streamlit Config ----------
@@ -53,6 +58,27 @@ if "session_start_time" not in st.session_state:
     st.session_state.session_start_time = None
 
 
+def get_detector(detection_confidence, tracking_confidence):
+    """
+    Pose detector for this browser session, reused across Start/Stop cycles.
+    
+    PoseDetector holds per-stream tracking state and is not thread-safe, so it
+    is cached in session_state rather than shared between sessions.
+    """
+    key = (detection_confidence, tracking_confidence)
+    cached = st.session_state.get("_detector")
+    if cached is None or cached[0] != key:
+        if cached is not None:
+            cached[1].close()
+        # Load the model up front so a broken model fails at Start, not mid-session
+        cached = (key, PoseDetector(
+            detection_confidence=detection_confidence,
+            tracking_confidence=tracking_confidence
+        ).load())
+        st.session_state["_detector"] = cached
+    return cached[1]
+
+
 # ---------- Sidebar Controls ----------
 st.sidebar.header("🧩 Exercise Controls")
 exercise_type = st.sidebar.selectbox("Select Exercise", ["Arm Raise", "Knee Bend", "Shoulder Roll"])
@@ -100,13 +126,15 @@ with col_right:
 
 # ---------- Button Actions ----------
 if start_button and not st.session_state.is_running:
-    st.session_state.is_running = True
-    st.session_state.session_start_time = time.time()
-    st.session_state.exercise_instance = ArmRaiseExercise(
-        detection_confidence=confidence_threshold,
-        tracking_confidence=confidence_threshold
-    )
-    st.rerun()
+    try:
+        detector = get_detector(confidence_threshold, confidence_threshold)
+    except Exception as e:
+        status_placeholder.error(f"⚠️ Could not load the pose model: {str(e)}")
+    else:
+        st.session_state.is_running = True
+        st.session_state.session_start_time = time.time()
+        st.session_state.exercise_instance = ArmRaiseExercise(detector=detector)
+        st.rerun()
 
 if stop_button and st.session_state.is_running:
     st.session_state.is_running = False
@@ -148,13 +176,34 @@ if stop_button and st.session_state.is_running:
 if reset_button:
     st.session_state.exercise_data = []
     st.session_state.is_running = False
-    st.session_state.exercise_instance = None
+    if st.session_state.exercise_instance:
+        st.session_state.exercise_instance.reset()  # Keep the loaded detector
     st.session_state.session_start_time = None
     st.session_state.analytics = ExerciseAnalytics()  # Reset analytics too
+    st.session_state.pop("_df_cache", None)
+    st.session_state.pop("_metrics_cache", None)
     st.success("✅ Session reset successfully!")
     st.rerun()
 
 
+# ---------- Live Stats ----------
+def render_live_stats(exercise):
+    """Build the live stats panel as one HTML fragment using the .metric-card style."""
+    feedback = html.escape(exercise.feedback) if exercise.feedback else ""
+    return f"""
+<div style="display: grid; grid-template-columns: 1fr 1fr; gap: 10px; margin-bottom: 10px;">
+    <div class="metric-card">🏋️ Reps<h2>{exercise.rep_count}</h2></div>
+    <div class="metric-card">⭐ Points<h2>{exercise.points}</h2></div>
+</div>
+<div style="display: grid; grid-template-columns: 1fr 1fr 1fr; gap: 10px; margin-bottom: 10px;">
+    <div class="metric-card">Perfect<h3>{exercise.perfect_reps}</h3>+{exercise.perfect_reps * 10} pts</div>
+    <div class="metric-card">Good<h3>{exercise.good_reps}</h3>+{exercise.good_reps * 7} pts</div>
+    <div class="metric-card">Okay<h3>{exercise.okay_reps}</h3>+{exercise.okay_reps * 5} pts</div>
+</div>
+<div class="metric-card">💬 <b>{feedback}</b></div>
+"""
+
+
 # ---------- Live Exercise Logic ----------
 if st.session_state.is_running:
     cap = cv2.VideoCapture(0)
@@ -164,63 +213,69 @@ if st.session_state.is_running:
         st.session_state.is_running = False
         st.stop()
     
+    # Keep only the freshest frame in the driver queue and ask for MJPEG
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+    
     status_placeholder.info("📸 Camera Active — Exercise in progress...")
     
     exercise = st.session_state.exercise_instance
     frame_count = 0
     
-    # Create placeholders for stats
-    with stats_placeholder.container():
-        stat_col1, stat_col2 = st.columns(2)
-        rep_metric = stat_col1.empty()
-        point_metric = stat_col2.empty()
-        
-        stat_col3, stat_col4, stat_col5 = st.columns(3)
-        perfect_metric = stat_col3.empty()
-        good_metric = stat_col4.empty()
-        okay_metric = stat_col5.empty()
-        
-        feedback_box = st.empty()
+    # Throttle Streamlit redraws to ~30 FPS without pacing the capture loop
+    RENDER_INTERVAL = 1 / 30
+    last_render = time.monotonic()
+    
+    # Single placeholder for all live stats (one update per refresh)
+    stats_html = stats_placeholder.empty()
+    
+    # Capture runs on its own thread so slow UI updates don't stall the camera
+    frames = Queue(maxsize=1)
+    stop_capture = threading.Event()
+    capture_thread = threading.Thread(
+        target=capture_latest, args=(cap, frames, stop_capture),
+        # Mirror on the capture thread; a real copy is needed because the
+        # HUD text drawn later must not be mirrored
+        kwargs={"transform": lambda frame: cv2.flip(frame, 1)}, daemon=True
+    )
+    capture_thread.start()
     
     try:
         while st.session_state.is_running:
-            success, frame = cap.read()
-            if not success:
+            try:
+                frame = frames.get(timeout=0.1)
+            except Empty:
+                continue
+            
+            if frame is None:
                 status_placeholder.error("⚠️ Failed to read frame from camera.")
                 break
             
-            # Mirror and process frame
-            frame = cv2.flip(frame, 1)
-            frame = exercise.process_frame(frame)
+            # Only frames that will be displayed get overlays drawn
+            now = time.monotonic()
+            render = now - last_render >= RENDER_INTERVAL
+            
+            # Process the (already mirrored) frame; the detector downscales
+            # before its own colour conversion
+            frame = exercise.process_frame(frame, render=render)
             
-            # Convert for Streamlit display
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            FRAME_WINDOW.image(frame_rgb, channels="RGB", use_column_width=True)
+            # Display (throttled); Streamlit does the only BGR->RGB pass
+            if render:
+                FRAME_WINDOW.image(frame, channels="BGR", use_column_width=True)
+                last_render = now
             
             # Update stats every 10 frames for performance
             if frame_count % 10 == 0:
-                rep_metric.metric("🏋️ Reps", exercise.rep_count)
-                point_metric.metric("⭐ Points", exercise.points)
-                perfect_metric.metric("Perfect", exercise.perfect_reps, 
-                                    delta=f"+{exercise.perfect_reps*10} pts")
-                good_metric.metric("Good", exercise.good_reps, 
-                                 delta=f"+{exercise.good_reps*7} pts")
-                okay_metric.metric("Okay", exercise.okay_reps, 
-                                 delta=f"+{exercise.okay_reps*5} pts")
-                
-                # Show feedback
-                if exercise.feedback:
-                    feedback_box.info(f"💬 **{exercise.feedback}**")
+                stats_html.markdown(render_live_stats(exercise), unsafe_allow_html=True)
             
             frame_count += 1
             
-            # Small delay
-            time.sleep(0.03)  # ~30 FPS
-            
     except Exception as e:
         status_placeholder.error(f"⚠️ Error during exercise: {str(e)}")
     
     finally:
+        stop_capture.set()
+        capture_thread.join(timeout=1.0)
         cap.release()
         st.session_state.is_running = False
 
@@ -230,12 +285,34 @@ else:
     stats_placeholder.info("📊 Stats will appear here during exercise")
 
 
+# ---------- Analytics Cache ----------
+def get_session_df():
+    """DataFrame of exercise_data, rebuilt only when sessions were added."""
+    n_sessions = len(st.session_state.exercise_data)
+    cached = st.session_state.get("_df_cache")
+    if cached is None or cached[0] != n_sessions:
+        cached = (n_sessions, pd.DataFrame(st.session_state.exercise_data))
+        st.session_state["_df_cache"] = cached
+    return cached[1]
+
+
+def get_cached_metrics(exercise_type):
+    """Progress metrics, recomputed only when the exercise or session count changes."""
+    key = (exercise_type, len(st.session_state.exercise_data))
+    cached = st.session_state.get("_metrics_cache")
+    if cached is None or cached[0] != key:
+        cached = (key, st.session_state.analytics.get_progress_metrics(exercise_type))
+        st.session_state["_metrics_cache"] = cached
+    return cached[1]
+
+
 # ---------- Analytics Display ----------
 st.divider()
 st.header("📊 Exercise Progress Analytics")
 
 if len(st.session_state.exercise_data) > 0:
-    metrics = st.session_state.analytics.get_progress_metrics(exercise_type)
+    metrics = get_cached_metrics(exercise_type)
+    df = get_session_df()
     
     if metrics:
         # Top metrics
@@ -263,9 +340,7 @@ if len(st.session_state.exercise_data) > 0:
         
         # Performance graph
         st.subheader("📈 Performance Over Time")
-        if len(st.session_state.exercise_data) > 1:
-            df = pd.DataFrame(st.session_state.exercise_data)
-            
+        if len(df) > 1:
             # Create chart data
             chart_data = pd.DataFrame({
                 'Reps': df['reps'].values,
@@ -286,19 +361,19 @@ if len(st.session_state.exercise_data) > 0:
         
         # Session history table
         with st.expander("📋 View Session History"):
-            df = pd.DataFrame(st.session_state.exercise_data)
-            df['timestamp'] = df['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S')
-            st.dataframe(df, use_container_width=True)
+            history_df = df.assign(timestamp=df['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S'))
+            st.dataframe(history_df, use_container_width=True)
         
         # Export option
         if st.button("💾 Export Session Data"):
-            export_df = pd.DataFrame(st.session_state.exercise_data)
-            csv = export_df.to_csv(index=False)
+            # Write compressed CSV straight into a bytes buffer
+            buf = io.BytesIO()
+            df.to_csv(buf, index=False, compression='gzip')
             st.download_button(
                 label="📥 Download CSV",
-                data=csv,
-                file_name=f"rehab_session_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                mime="text/csv"
+                data=buf.getvalue(),
+                file_name=f"rehab_session_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv.gz",
+                mime="application/gzip"
             )
 
 else:
@@ -5,12 +5,26 @@ Shows detected landmarks and skeleton overlay.
 """
 
 import cv2
+import numpy as np
 import sys
+import threading
+from queue import Queue, Empty
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
-from modules.PoseModule import PoseDetector
+from modules.PoseModule import PoseDetector, capture_latest
+
+# Joint triples (a, b, c) with b as the vertex: right/left arm, right/left leg
+JOINT_TRIPLES = np.array([
+    [12, 14, 16],
+    [11, 13, 15],
+    [24, 26, 28],
+    [23, 25, 27],
+], dtype=np.intp)
+
+# Draw and display every Nth frame; inference still runs on every frame
+RENDER_EVERY = 2
 
 
 def main():
@@ -36,6 +50,9 @@ def main():
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
     
+    # Keep the driver queue short so frames are fresh when read
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    
     # Initialize pose detector
     detector = PoseDetector(
         detection_confidence=0.7,
@@ -47,73 +64,91 @@ def main():
     show_angles = False
     frame_count = 0
     
+    # Black info panel covering rectangle (10,10)-(400,150), allocated once
+    panel_bg = np.zeros((141, 391, 3), np.uint8)
+    
+    # Capture runs on its own thread and only the newest frame is kept
+    frames = Queue(maxsize=1)
+    stop_capture = threading.Event()
+    capture_thread = threading.Thread(
+        target=capture_latest, args=(cap, frames, stop_capture), daemon=True
+    )
+    capture_thread.start()
+    
     print("✅ Webcam started successfully!")
     print("📸 Stand in front of the camera...")
     
-    while cap.isOpened():
-        success, img = cap.read()
+    while True:
+        try:
+            img = frames.get(timeout=0.1)
+        except Empty:
+            # Keep the window responsive (and 'q' working) if the camera stalls
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                print("\n👋 Exiting...")
+                break
+            continue
         
-        if not success:
+        if img is None:
             print("⚠️ Failed to read frame")
             break
         
+        # Only every RENDER_EVERY-th frame is drawn and shown
+        frame_count += 1
+        render = frame_count % RENDER_EVERY == 0
+        
         # Mirror the image
         img = cv2.flip(img, 1)
         
         # Detect pose
-        img = detector.find_pose(img, draw=show_landmarks)
+        img = detector.find_pose(img, draw=show_landmarks and render)
         lmList = detector.find_positions(img, draw=False)
         
-        # Show detection status
-        if len(lmList) > 0:
-            status = "✓ Person Detected"
-            status_color = (0, 255, 0)
-            
-            # Show angles if enabled
-            if show_angles:
-                # Right arm angle
-                right_angle = detector.find_angle(img, 12, 14, 16, draw=True)
-                # Left arm angle
-                left_angle = detector.find_angle(img, 11, 13, 15, draw=True)
+        if render:
+            # Show detection status
+            if len(lmList) > 0:
+                status = "✓ Person Detected"
+                status_color = (0, 255, 0)
                 
-                # Right leg angle
-                right_leg = detector.find_angle(img, 24, 26, 28, draw=True)
-                # Left leg angle
-                left_leg = detector.find_angle(img, 23, 25, 27, draw=True)
-        else:
-            status = "✗ No Person Detected"
-            status_color = (0, 0, 255)
-        
-        # Draw info panel
-        h, w, _ = img.shape
-        
-        # Semi-transparent background
-        overlay = img.copy()
-        cv2.rectangle(overlay, (10, 10), (400, 150), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.6, img, 0.4, 0, img)
-        
-        # Status
-        cv2.putText(img, status, (20, 45),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, status_color, 2)
-        
-        # Landmarks count
-        cv2.putText(img, f"Landmarks: {len(lmList)}", (20, 80),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-        
-        # FPS
-        frame_count += 1
-        cv2.putText(img, f"Frame: {frame_count}", (20, 115),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-        
-        # Controls help
-        cv2.putText(img, "Press 'q' to quit | 'd' landmarks | 'a' angles", 
-                   (10, h - 20), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
-        
-        # Display the result
-        cv2.imshow("Pose Detection Demo", img)
+                # Show angles if enabled
+                if show_angles:
+                    # Arm and leg angles computed in a single batch
+                    angles = detector.find_angles_batch(JOINT_TRIPLES)
+                    for (p1, p2, p3), angle in zip(JOINT_TRIPLES, angles):
+                        detector.draw_angle(img, p1, p2, p3, angle)
+            else:
+                status = "✗ No Person Detected"
+                status_color = (0, 0, 255)
+            
+            # Draw info panel
+            h, w, _ = img.shape
+            
+            # Semi-transparent background, blended in place over the panel ROI
+            # (clipped to the frame, as cv2.rectangle would)
+            panel = img[10:151, 10:401]
+            ph, pw = panel.shape[:2]
+            cv2.addWeighted(panel_bg[:ph, :pw], 0.6, panel, 0.4, 0, dst=panel)
+            
+            # Status
+            cv2.putText(img, status, (20, 45),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, status_color, 2)
+            
+            # Landmarks count
+            cv2.putText(img, f"Landmarks: {len(lmList)}", (20, 80),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+            
+            # FPS
+            cv2.putText(img, f"Frame: {frame_count}", (20, 115),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+            
+            # Controls help
+            cv2.putText(img, "Press 'q' to quit | 'd' landmarks | 'a' angles", 
+                       (10, h - 20), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+            
+            # Display the result
+            cv2.imshow("Pose Detection Demo", img)
         
-        # Handle keyboard input
-        key = cv2.waitKey(10) & 0xFF
+        # Handle keyboard input (minimal blocking wait, polled every frame)
+        key = cv2.waitKey(1) & 0xFF
         
         if key == ord('q'):
             print("\n👋 Exiting...")
@@ -126,6 +161,8 @@ def main():
             print(f"📐 Angles: {'ON' if show_angles else 'OFF'}")
     
     # Cleanup
+    stop_capture.set()
+    capture_thread.join(timeout=1.0)
     cap.release()
     cv2.destroyAllWindows()
     print("✅ Demo completed!")
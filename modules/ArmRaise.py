@@ -1,14 +1,95 @@
 import cv2
+import numpy as np
 import sys
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
+# njit is numba's, or a no-op fallback that leaves the state machine as plain Python
 try:
-    from modules.PoseModule import PoseDetector
+    from modules.PoseModule import PoseDetector, njit
 except ImportError:
-    from PoseModule import PoseDetector
+    from PoseModule import PoseDetector, njit
+
+
+# Shoulder-elbow-wrist triples: right arm (12, 14, 16), left arm (11, 13, 15)
+ARM_TRIPLES = np.array([[12, 14, 16], [11, 13, 15]], dtype=np.intp)
+
+# Angle thresholds
+ANGLE_DOWN = 40  # Arms considered down
+ANGLE_UP = 120   # Arms considered raised
+ANGLE_GOOD_MIN = 110
+ANGLE_PERFECT_MIN = 130
+ANGLE_PERFECT_MAX = 150
+
+# Slots of the ArmRaiseExercise counter block
+STAT_REPS, STAT_POINTS, STAT_PERFECT, STAT_GOOD, STAT_OKAY, STAT_DIRECTION = range(6)
+
+# Feedback codes returned by update_state
+FEEDBACK_DOWN, FEEDBACK_PERFECT, FEEDBACK_GOOD, FEEDBACK_OKAY, \
+    FEEDBACK_HOLD, FEEDBACK_RAISING, FEEDBACK_LOWERING = range(7)
+FEEDBACK_MESSAGES = (
+    "Arms Down - Ready",
+    "Perfect Form! +10 pts 🌟",
+    "Good Form! +7 pts 👍",
+    "Keep Going! +5 pts 💪",
+    "Arms Up - Hold",
+    "Raising arms...",
+    "Lowering arms...",
+)
+
+
+@njit(cache=True)
+def update_state(right_angle, left_angle, stats, angle_down=ANGLE_DOWN, angle_up=ANGLE_UP,
+                 angle_perfect_min=ANGLE_PERFECT_MIN, angle_perfect_max=ANGLE_PERFECT_MAX,
+                 angle_good_min=ANGLE_GOOD_MIN):
+    """
+    Arm raise rep-counting state machine over a counter block.
+    
+    Args:
+        right_angle, left_angle: Shoulder angles in degrees
+        stats: int32 counter array indexed by the STAT_* constants;
+            updated in place
+        angle_down, angle_up: Below/above these both arms count as down/raised
+        angle_perfect_min, angle_perfect_max: Range for a perfect rep
+        angle_good_min: Above this both arms count as a good rep
+        
+    Returns:
+        Feedback code (index into FEEDBACK_MESSAGES)
+    """
+    # Arms down position
+    if right_angle < angle_down and left_angle < angle_down:
+        stats[STAT_DIRECTION] = 0
+        return FEEDBACK_DOWN
+    
+    # Arms raised position
+    if right_angle > angle_up and left_angle > angle_up:
+        if stats[STAT_DIRECTION] == 1:
+            return FEEDBACK_HOLD
+        
+        # Just raised arms (transition from down to up)
+        stats[STAT_DIRECTION] = 1
+        stats[STAT_REPS] += 1
+        
+        # Award points based on form quality
+        if (angle_perfect_min <= right_angle <= angle_perfect_max and
+                angle_perfect_min <= left_angle <= angle_perfect_max):
+            stats[STAT_POINTS] += 10
+            stats[STAT_PERFECT] += 1
+            return FEEDBACK_PERFECT
+        if right_angle > angle_good_min and left_angle > angle_good_min:
+            stats[STAT_POINTS] += 7
+            stats[STAT_GOOD] += 1
+            return FEEDBACK_GOOD
+        stats[STAT_POINTS] += 5
+        stats[STAT_OKAY] += 1
+        return FEEDBACK_OKAY
+    
+    # In between (transitioning)
+    if stats[STAT_DIRECTION] == 0:
+        return FEEDBACK_RAISING
+    return FEEDBACK_LOWERING
 
 
 class ArmRaiseExercise:
@@ -17,123 +98,171 @@ class ArmRaiseExercise:
     Counts arm raises and provides real-time feedback
     """
     
-    def __init__(self, detection_confidence=0.7, tracking_confidence=0.7):
+    # Angle thresholds; override per instance (e.g. exercise.ANGLE_UP = 100)
+    ANGLE_DOWN = ANGLE_DOWN
+    ANGLE_UP = ANGLE_UP
+    ANGLE_PERFECT_MIN = ANGLE_PERFECT_MIN
+    ANGLE_PERFECT_MAX = ANGLE_PERFECT_MAX
+    
+    def __init__(self, detection_confidence=0.7, tracking_confidence=0.7, model_path=None,
+                 inference_interval=3, detector=None):
         """
         Initialize the Arm Raise Exercise tracker.
         
         Args:
             detection_confidence: Pose detection confidence threshold
             tracking_confidence: Pose tracking confidence threshold
+            model_path: Optional quantized .tflite pose model (see PoseDetector)
+            inference_interval: Run pose inference on every Nth frame (1 = every frame)
+            detector: Optional pre-built PoseDetector to reuse; the confidence
+                and model arguments are ignored when given
         """
         # Initialize pose detector with good confidence values
-        self.detector = PoseDetector(
-            detection_confidence=detection_confidence,
-            tracking_confidence=tracking_confidence
-        )
-        
-        # Tracking variables
-        self.arm_counter = 0
-        self.rep_count = 0  # Alias for compatibility
-        self.direction = 0  # 0 = down, 1 = up
-        self.points = 0
+        if detector is None:
+            detector = PoseDetector(
+                detection_confidence=detection_confidence,
+                tracking_confidence=tracking_confidence,
+                model_path=model_path
+            )
+        self.detector = detector
+        
+        # Tracking variables: reps, points, perfect/good/okay reps and
+        # direction (0 = down, 1 = up) packed in one block, see STAT_*
+        self._stats = np.zeros(6, dtype=np.int32)
         self.feedback = "Waiting for person..."
         
-        # Performance tracking
-        self.perfect_reps = 0
-        self.good_reps = 0
-        self.okay_reps = 0
+        # Keyframe inference with interpolated landmarks in between
+        self.inference_interval = max(1, int(inference_interval))
+        self._frame_idx = 0
+        self._lm_prev = None
+        self._lm_curr = None
         
-        # Angle thresholds
-        self.ANGLE_DOWN = 40  # Arms considered down
-        self.ANGLE_UP = 120   # Arms considered raised
-        self.ANGLE_PERFECT_MIN = 130
-        self.ANGLE_PERFECT_MAX = 150
+        # Pre-allocated black HUD panel, blended over the frame's ROI only
+        self._hud_bg = np.zeros((201, 321, 3), np.uint8)  # rectangle (0,0)-(320,200)
+        self._hud_alpha = 0.6
+    
+    @property
+    def arm_counter(self):
+        return int(self._stats[STAT_REPS])
+    
+    @property
+    def rep_count(self):
+        """Alias of arm_counter for compatibility"""
+        return int(self._stats[STAT_REPS])
     
-    def process_frame(self, img):
+    @property
+    def points(self):
+        return int(self._stats[STAT_POINTS])
+    
+    @property
+    def perfect_reps(self):
+        return int(self._stats[STAT_PERFECT])
+    
+    @property
+    def good_reps(self):
+        return int(self._stats[STAT_GOOD])
+    
+    @property
+    def okay_reps(self):
+        return int(self._stats[STAT_OKAY])
+    
+    @property
+    def direction(self):
+        return int(self._stats[STAT_DIRECTION])
+    
+    def process_frame(self, img, render=True):
         """
         Process each frame and detect arm raises
         
+        Pose inference only runs on every ``inference_interval``-th frame
+        (keyframes). In between, the drawn skeleton is linearly interpolated
+        from the previous to the latest keyframe, so it trails the live
+        landmarks by one keyframe interval. Rep counting only ever sees real
+        keyframe landmarks.
+        
         Args:
             img: Input frame from webcam
+            render: Whether the frame will be displayed; when False all
+                drawing is skipped and only the rep state is updated
             
         Returns:
             Processed frame with overlays
         """
-        # Detect pose
-        img = self.detector.find_pose(img, draw=True)
-        lmList = self.detector.find_positions(img, draw=False)
+        step = self._frame_idx % self.inference_interval
+        keyframe = step == 0
+        self._frame_idx += 1
         
-        # Check if person is detected
-        if len(lmList) == 0:
-            self.feedback = "No person detected"
-            self._draw_ui(img)
-            return img
-        
-        # Calculate shoulder angles (shoulder-elbow-wrist)
-        # Right arm: shoulder(12), elbow(14), wrist(16)
-        # Left arm: shoulder(11), elbow(13), wrist(15)
-        right_shoulder_angle = self.detector.find_angle(img, 12, 14, 16, draw=False)
-        left_shoulder_angle = self.detector.find_angle(img, 11, 13, 15, draw=False)
+        # Detect pose on keyframes only
+        if keyframe:
+            img = self.detector.find_pose(img, draw=False)
+            self.detector.find_positions(img, draw=False)
+            self._lm_prev = self._lm_curr if self._lm_curr is not None else self.detector.lm
+            self._lm_curr = self.detector.lm
+            
+            # Exercise logic runs on real landmarks only
+            self._update_state(self._lm_curr)
         
-        # Handle None values (landmarks not visible)
-        if right_shoulder_angle is None or left_shoulder_angle is None:
-            self.feedback = "Arms not visible"
-            self._draw_ui(img)
+        if not render:
             return img
         
-        # Display angles for debugging
-        cv2.putText(img, f"Right: {int(right_shoulder_angle)}°", (50, 100),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-        cv2.putText(img, f"Left: {int(left_shoulder_angle)}°", (50, 130),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-        
-        # Exercise logic - detect arm raises
-        # Arms down position
-        if right_shoulder_angle < self.ANGLE_DOWN and left_shoulder_angle < self.ANGLE_DOWN:
-            self.feedback = "Arms Down - Ready"
-            self.direction = 0
-        
-        # Arms raised position
-        elif right_shoulder_angle > self.ANGLE_UP and left_shoulder_angle > self.ANGLE_UP:
-            if self.direction == 0:  # Just raised arms (transition from down to up)
-                self.arm_counter += 1
-                self.rep_count = self.arm_counter  # Keep in sync
-                self.direction = 1
-                
-                # Award points based on form quality
-                if (self.ANGLE_PERFECT_MIN <= right_shoulder_angle <= self.ANGLE_PERFECT_MAX and
-                    self.ANGLE_PERFECT_MIN <= left_shoulder_angle <= self.ANGLE_PERFECT_MAX):
-                    self.points += 10
-                    self.perfect_reps += 1
-                    self.feedback = "Perfect Form! +10 pts 🌟"
-                elif (right_shoulder_angle > 110 and left_shoulder_angle > 110):
-                    self.points += 7
-                    self.good_reps += 1
-                    self.feedback = "Good Form! +7 pts 👍"
-                else:
-                    self.points += 5
-                    self.okay_reps += 1
-                    self.feedback = "Keep Going! +5 pts 💪"
-            else:
-                self.feedback = "Arms Up - Hold"
-        
-        # In between (transitioning)
+        # Interpolated skeleton for display
+        if self.inference_interval == 1:
+            lm = self._lm_curr
         else:
-            if self.direction == 0:
-                self.feedback = "Raising arms..."
-            else:
-                self.feedback = "Lowering arms..."
+            t = step / self.inference_interval
+            lm = (1 - t) * self._lm_prev + t * self._lm_curr
+        self.detector.draw_landmarks(img, lm)
+        
+        # Display angles for debugging
+        right_shoulder_angle, left_shoulder_angle = self.detector.find_angles_batch(ARM_TRIPLES, lm)
+        if not (np.isnan(right_shoulder_angle) or np.isnan(left_shoulder_angle)):
+            cv2.putText(img, f"Right: {int(right_shoulder_angle)}°", (50, 100),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+            cv2.putText(img, f"Left: {int(left_shoulder_angle)}°", (50, 130),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
         
         # Draw UI overlay
         self._draw_ui(img)
         return img
     
+    def _update_state(self, lm):
+        """
+        Advance rep counting and feedback from one set of real landmarks
+        
+        Args:
+            lm: (33, 2) landmark array from the detector, NaN where not visible
+        """
+        # Check if person is detected
+        if np.isnan(lm).all():
+            self.feedback = "No person detected"
+            return
+        
+        # Calculate shoulder angles (shoulder-elbow-wrist) in one batch
+        right_shoulder_angle, left_shoulder_angle = self.detector.find_angles_batch(ARM_TRIPLES, lm)
+        
+        # Handle missing landmarks (not visible)
+        if np.isnan(right_shoulder_angle) or np.isnan(left_shoulder_angle):
+            self.feedback = "Arms not visible"
+            return
+        
+        # Exercise logic - detect arm raises
+        feedback_code = update_state(float(right_shoulder_angle), float(left_shoulder_angle),
+                                     self._stats,
+                                     float(self.ANGLE_DOWN), float(self.ANGLE_UP),
+                                     float(self.ANGLE_PERFECT_MIN), float(self.ANGLE_PERFECT_MAX),
+                                     float(ANGLE_GOOD_MIN))
+        self.feedback = FEEDBACK_MESSAGES[feedback_code]
+    
     def _draw_ui(self, img):
         """Draw counter, points, and feedback overlay"""
-        # Semi-transparent background
-        overlay = img.copy()
-        cv2.rectangle(overlay, (0, 0), (320, 200), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.6, img, 0.4, 0, img)
+        # Clip the panel to the frame, as cv2.rectangle/putText would
+        bg_h = min(self._hud_bg.shape[0], img.shape[0])
+        bg_w = min(self._hud_bg.shape[1], img.shape[1])
+        
+        # Semi-transparent background, blended in place over the ROI only
+        roi = img[0:bg_h, 0:bg_w]
+        cv2.addWeighted(self._hud_bg[0:bg_h, 0:bg_w], self._hud_alpha,
+                        roi, 1 - self._hud_alpha, 0, dst=roi)
         
         # Repetition count
         cv2.putText(img, f'Reps: {int(self.arm_counter)}', (15, 45),
@@ -164,15 +293,12 @@ class ArmRaiseExercise:
         }
     
     def reset(self):
-        """Reset all counters"""
-        self.arm_counter = 0
-        self.rep_count = 0
-        self.direction = 0
-        self.points = 0
-        self.perfect_reps = 0
-        self.good_reps = 0
-        self.okay_reps = 0
+        """Reset all counters and the keyframe state of the last session"""
+        self._stats[:] = 0
         self.feedback = "Waiting for person..."
+        self._frame_idx = 0
+        self._lm_prev = None
+        self._lm_curr = None
 
 
 def main():
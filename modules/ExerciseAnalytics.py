@@ -1,7 +1,21 @@
+import csv
+import numpy as np
 import pandas as pd
+from collections import OrderedDict, deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
-import statistics
+from typing import Dict, List, Optional, Tuple
+
+
+SESSION_COLUMNS = ['timestamp', 'exercise_type', 'reps', 'avg_form_score', 'duration']
+
+# Initial capacity of the per-column arrays; doubled whenever it runs out
+_INITIAL_CAPACITY = 16
+
+# Maximum number of memoized get_progress_metrics results (LRU)
+_METRICS_CACHE_SIZE = 32
+
+# Number of most recent sessions checked for form and duration consistency
+_RECENT_SESSIONS = 3
 
 
 class ExerciseAnalytics:
@@ -13,9 +27,129 @@ class ExerciseAnalytics:
     def __init__(self):
         """Initialize the analytics engine with empty session history."""
         self.sessions: List[Dict] = []
-        self.session_history = pd.DataFrame(columns=[
-            'timestamp', 'exercise_type', 'reps', 'avg_form_score', 'duration'
-        ])
+        self._df_cache: Optional[pd.DataFrame] = None
+        self._dirty = True
+        self._cache_version = 0
+        self._metrics_cache: "OrderedDict[tuple, Optional[tuple]]" = OrderedDict()
+        self._reset_arrays()
+    
+    def _mark_changed(self):
+        """Invalidate the cached DataFrame and memoized metrics after a write."""
+        self._dirty = True
+        self._cache_version += 1
+        self._metrics_cache.clear()
+    
+    def _reset_arrays(self):
+        """Allocate empty per-column arrays backing the metrics computations."""
+        self._n = 0
+        self._ts = np.empty(_INITIAL_CAPACITY, dtype='datetime64[ns]')
+        self._reps = np.empty(_INITIAL_CAPACITY, dtype=np.int32)
+        self._form = np.empty(_INITIAL_CAPACITY, dtype=np.float64)
+        self._dur = np.empty(_INITIAL_CAPACITY, dtype=np.float64)
+        # Exercise types are dictionary-encoded as integer codes, so filtering
+        # is an integer compare; codes are assigned in first-seen order. int32
+        # because imported files may hold any number of distinct types
+        self._types_arr = np.empty(_INITIAL_CAPACITY, dtype=np.int32)
+        self._type_codes: Dict[str, int] = {}
+        
+        # Running totals for get_exercise_summary
+        self._total_reps = 0
+        self._total_duration = 0.0
+        self._form_sum = 0.0
+        
+        # Ring buffers of the latest form scores and durations, per exercise
+        # type and under None for all exercises
+        self._recent: Dict[Optional[str], Tuple[deque, deque]] = {}
+    
+    def _reserve(self, size: int):
+        """Grow the column arrays, doubling capacity, until they hold size rows."""
+        capacity = len(self._reps)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name in ('_ts', '_reps', '_form', '_dur', '_types_arr'):
+            old = getattr(self, name)
+            grown = np.empty(capacity, dtype=old.dtype)
+            grown[:self._n] = old[:self._n]
+            setattr(self, name, grown)
+    
+    @staticmethod
+    def _convert_row(session_data: Dict) -> tuple:
+        """
+        Validate one session and convert it to typed column values.
+        
+        Args:
+            session_data: Session dictionary with the SESSION_COLUMNS fields
+            
+        Returns:
+            Tuple of (timestamp, exercise_type, reps, avg_form_score, duration)
+            
+        Raises:
+            ValueError: If a field is missing (None/NaN) or not convertible
+        """
+        timestamp, exercise_type, reps, form, duration = (
+            session_data[field] for field in SESSION_COLUMNS)
+        if any(pd.isna(value) for value in (timestamp, exercise_type, reps, form, duration)):
+            raise ValueError(f"Session has missing values: {session_data}")
+        try:
+            return (pd.Timestamp(timestamp).to_datetime64(), exercise_type,
+                    int(reps), float(form), float(duration))
+        except (TypeError, OverflowError) as e:
+            raise ValueError(f"Invalid session values: {session_data}") from e
+    
+    def _append_row(self, row: tuple):
+        """
+        Append one converted session to the column arrays.
+        
+        Args:
+            row: Typed values as returned by _convert_row
+        """
+        timestamp, exercise_type, reps, form, duration = row
+        self._reserve(self._n + 1)
+        
+        i = self._n
+        self._ts[i] = timestamp
+        self._reps[i] = reps
+        self._form[i] = form
+        self._dur[i] = duration
+        self._types_arr[i] = self._type_codes.setdefault(exercise_type, len(self._type_codes))
+        self._n += 1
+        
+        self._total_reps += reps
+        self._total_duration += duration
+        self._form_sum += form
+        
+        for key in (None, exercise_type):
+            if key not in self._recent:
+                self._recent[key] = (deque(maxlen=_RECENT_SESSIONS),
+                                     deque(maxlen=_RECENT_SESSIONS))
+            recent_form, recent_dur = self._recent[key]
+            recent_form.append(form)
+            recent_dur.append(duration)
+    
+    @property
+    def session_history(self) -> pd.DataFrame:
+        """Session history as a DataFrame, built lazily from self.sessions."""
+        return self._get_df()
+    
+    def _get_df(self) -> pd.DataFrame:
+        """
+        Materialize the sessions list into a DataFrame, reusing the cached
+        frame until a session is added or the history changes.
+        
+        Returns:
+            DataFrame with one row per session
+        """
+        if self._dirty or self._df_cache is None:
+            if self.sessions:
+                df = pd.DataFrame(self.sessions)
+                df['timestamp'] = pd.to_datetime(df['timestamp'])
+            else:
+                df = pd.DataFrame(columns=SESSION_COLUMNS)
+            self._df_cache = df
+            self._dirty = False
+        return self._df_cache
     
     def add_exercise_session(self, session_data: Dict):
         """
@@ -34,12 +168,16 @@ class ExerciseAnalytics:
         if not all(field in session_data for field in required_fields):
             return
         
-        # Add to sessions list
-        self.sessions.append(session_data)
+        # Reject missing or non-numeric values before anything is stored
+        try:
+            row = self._convert_row(session_data)
+        except ValueError:
+            return
         
-        # Update DataFrame
-        new_row = pd.DataFrame([session_data])
-        self.session_history = pd.concat([self.session_history, new_row], ignore_index=True)
+        # Add to sessions list; the DataFrame is rebuilt lazily on the next read
+        self.sessions.append(session_data)
+        self._append_row(row)
+        self._mark_changed()
     
     def get_progress_metrics(self, exercise_type: Optional[str] = None) -> Optional[Dict]:
         """
@@ -51,124 +189,171 @@ class ExerciseAnalytics:
         Returns:
             Dictionary containing various metrics, or None if no data
         """
-        if len(self.session_history) == 0:
+        # Everything except the weekly stats depends only on the history;
+        # those are recomputed on every call since the week keeps rolling
+        key = (exercise_type, self._cache_version)
+        if key in self._metrics_cache:
+            self._metrics_cache.move_to_end(key)
+            entry = self._metrics_cache[key]
+        else:
+            entry = self._compute_progress_metrics(exercise_type)
+            self._metrics_cache[key] = entry
+            if len(self._metrics_cache) > _METRICS_CACHE_SIZE:
+                self._metrics_cache.popitem(last=False)
+        
+        if entry is None:
+            return None
+        
+        # Fresh containers each call, so callers can't corrupt the memo
+        metrics, (ts, reps, form) = entry
+        return {
+            **metrics,
+            'best_session': dict(metrics['best_session']),
+            'improvement_areas': list(metrics['improvement_areas']),
+            'weekly_stats': self._get_weekly_stats(ts, reps, form)
+        }
+    
+    def _compute_progress_metrics(self, exercise_type: Optional[str]) -> Optional[tuple]:
+        """
+        History-only part of get_progress_metrics, as memoized.
+        
+        Returns:
+            Tuple of (metrics without weekly_stats, (ts, reps, form) arrays of
+            the filtered sessions), or None if no data
+        """
+        n = self._n
+        if n == 0:
             return None
         
+        ts, reps, form, dur = self._ts[:n], self._reps[:n], self._form[:n], self._dur[:n]
+        
         # Filter by exercise type if specified
         if exercise_type:
-            df = self.session_history[self.session_history['exercise_type'] == exercise_type]
-        else:
-            df = self.session_history
+            code = self._type_codes.get(exercise_type)
+            if code is None:
+                return None
+            mask = self._types_arr[:n] == code
+            ts, reps, form, dur = ts[mask], reps[mask], form[mask], dur[mask]
         
-        if len(df) == 0:
+        if len(reps) == 0:
             return None
         
         # Calculate metrics
-        total_reps = int(df['reps'].sum())
-        total_sessions = len(df)
-        avg_form_score = float(df['avg_form_score'].mean())
-        avg_duration = float(df['duration'].mean())
+        total_reps = int(reps.sum())
+        total_sessions = len(reps)
+        avg_form_score = float(form.mean())
+        avg_duration = float(dur.mean())
         
         # Find best session
-        best_session_idx = df['avg_form_score'].idxmax()
-        best_session = df.loc[best_session_idx]
+        best = int(np.argmax(form))
         
         # Calculate improvement areas
-        improvement_areas = self._identify_improvement_areas(df)
+        improvement_areas = self._identify_improvement_areas(exercise_type or None, ts, form)
         
-        # Weekly progress
-        weekly_stats = self._get_weekly_stats(df)
-        
-        return {
+        metrics = {
             'total_reps': total_reps,
             'total_sessions': total_sessions,
             'avg_form_score': avg_form_score,
             'avg_duration': avg_duration,
             'best_session': {
-                'date': best_session['timestamp'].strftime('%Y-%m-%d %H:%M'),
-                'reps': int(best_session['reps']),
-                'form_score': float(best_session['avg_form_score']),
-                'duration': float(best_session['duration'])
+                'date': pd.Timestamp(ts[best]).strftime('%Y-%m-%d %H:%M'),
+                'reps': int(reps[best]),
+                'form_score': float(form[best]),
+                'duration': float(dur[best])
             },
-            'improvement_areas': improvement_areas,
-            'weekly_stats': weekly_stats
+            'improvement_areas': improvement_areas
         }
+        return metrics, (ts, reps, form)
     
-    def _identify_improvement_areas(self, df: pd.DataFrame) -> List[str]:
+    def _identify_improvement_areas(self, exercise_type: Optional[str],
+                                    ts: np.ndarray, form: np.ndarray) -> List[str]:
         """
         Identify areas where the user could improve.
         
         Args:
-            df: DataFrame with session data
+            exercise_type: Exercise type the arrays were filtered by, or None
+            ts: Session timestamps (datetime64[ns])
+            form: Average form score per session
             
         Returns:
             List of improvement suggestions
         """
         areas = []
         
+        n = len(form)
+        recent_form, recent_dur = self._recent[exercise_type]
+        
         # Check form score consistency
-        if len(df) >= 3:
-            recent_scores = df['avg_form_score'].tail(3).tolist()
-            if statistics.stdev(recent_scores) > 2.0:
-                areas.append("Form consistency - scores vary significantly")
+        if n >= _RECENT_SESSIONS and np.std(recent_form, ddof=1) > 2.0:
+            areas.append("Form consistency - scores vary significantly")
         
         # Check if form score is below optimal
-        avg_form = df['avg_form_score'].mean()
-        if avg_form < 7.0:
+        if form.mean() < 7.0:
             areas.append("Form quality - aim for higher accuracy")
         
-        # Check session frequency
-        if len(df) >= 2:
-            df_sorted = df.sort_values('timestamp')
-            time_gaps = df_sorted['timestamp'].diff().dt.total_seconds() / 3600  # hours
-            avg_gap = time_gaps.mean()
+        # Check session frequency; the mean of consecutive gaps of the sorted
+        # timestamps telescopes to (latest - earliest) / (n - 1)
+        if n >= 2:
+            ts_ns = ts.view('i8')
+            avg_gap = (ts_ns.max() - ts_ns.min()) / (n - 1) / 3.6e12  # hours
             
             if avg_gap > 48:  # More than 2 days between sessions
                 areas.append("Session frequency - try to exercise more regularly")
         
         # Check duration consistency
-        if len(df) >= 3:
-            recent_durations = df['duration'].tail(3).tolist()
-            if any(d < 30 for d in recent_durations):
-                areas.append("Session duration - longer sessions may improve results")
+        if n >= _RECENT_SESSIONS and min(recent_dur) < 30:
+            areas.append("Session duration - longer sessions may improve results")
         
         return areas
     
-    def _get_weekly_stats(self, df: pd.DataFrame) -> Dict:
+    def _get_weekly_stats(self, ts: np.ndarray, reps: np.ndarray, form: np.ndarray) -> Dict:
         """
         Calculate statistics for the past week.
         
         Args:
-            df: DataFrame with session data
+            ts: Session timestamps (datetime64[ns])
+            reps: Repetitions per session
+            form: Average form score per session
             
         Returns:
             Dictionary with weekly statistics
         """
-        if len(df) == 0:
+        if len(ts) == 0:
             return {
                 'sessions_this_week': 0,
                 'reps_this_week': 0,
                 'avg_form_this_week': 0.0
             }
         
-        # Get sessions from last 7 days
-        week_ago = datetime.now() - timedelta(days=7)
-        weekly_df = df[df['timestamp'] >= week_ago]
+        # Get sessions from last 7 days with a single int64 compare on the
+        # nanosecond view; the bound is converted once per call
+        week_ago = np.datetime64(datetime.now() - timedelta(days=7), 'ns').astype(np.int64)
+        weekly = ts.view('i8') >= week_ago
+        n_weekly = int(np.count_nonzero(weekly))
+        
+        if n_weekly == 0:
+            return {
+                'sessions_this_week': 0,
+                'reps_this_week': 0,
+                'avg_form_this_week': 0.0
+            }
         
         return {
-            'sessions_this_week': len(weekly_df),
-            'reps_this_week': int(weekly_df['reps'].sum()) if len(weekly_df) > 0 else 0,
-            'avg_form_this_week': float(weekly_df['avg_form_score'].mean()) if len(weekly_df) > 0 else 0.0
+            'sessions_this_week': n_weekly,
+            'reps_this_week': int(reps.sum(where=weekly)),
+            'avg_form_this_week': float(form.sum(where=weekly)) / n_weekly
         }
     
     def get_exercise_summary(self) -> Dict:
         """
         Get an overall summary of all exercises.
         
+        Served from running totals kept by _append_row, so no DataFrame is built.
+        
         Returns:
             Dictionary with summary statistics
         """
-        if len(self.session_history) == 0:
+        if self._n == 0:
             return {
                 'total_sessions': 0,
                 'total_reps': 0,
@@ -177,11 +362,11 @@ class ExerciseAnalytics:
             }
         
         return {
-            'total_sessions': len(self.session_history),
-            'total_reps': int(self.session_history['reps'].sum()),
-            'exercise_types': self.session_history['exercise_type'].unique().tolist(),
-            'total_time_spent': float(self.session_history['duration'].sum()),
-            'avg_form_score': float(self.session_history['avg_form_score'].mean())
+            'total_sessions': self._n,
+            'total_reps': self._total_reps,
+            'exercise_types': list(self._type_codes),
+            'total_time_spent': self._total_duration,
+            'avg_form_score': self._form_sum / self._n
         }
     
     def export_data(self, filepath: str):
@@ -191,10 +376,22 @@ class ExerciseAnalytics:
         Args:
             filepath: Path where to save the CSV file
         """
-        if len(self.session_history) > 0:
-            self.session_history.to_csv(filepath, index=False)
-            return True
-        return False
+        if len(self.sessions) == 0:
+            return False
+        
+        # Columns in first-seen order, as a DataFrame of the sessions would
+        # have them, so extra fields from imports or callers are kept
+        fieldnames = list(dict.fromkeys(key for session in self.sessions for key in session))
+        
+        # Stream rows straight from the sessions list; no DataFrame is built
+        with open(filepath, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(
+                {**session, 'timestamp': pd.Timestamp(session['timestamp']).isoformat(sep=' ')}
+                for session in self.sessions
+            )
+        return True
     
     def import_data(self, filepath: str):
         """
@@ -206,16 +403,135 @@ class ExerciseAnalytics:
         try:
             imported_df = pd.read_csv(filepath)
             imported_df['timestamp'] = pd.to_datetime(imported_df['timestamp'])
-            self.session_history = pd.concat([self.session_history, imported_df], ignore_index=True)
-            self.sessions = self.session_history.to_dict('records')
+            self._extend_from_frame(imported_df)
             return True
         except Exception as e:
             print(f"Error importing data: {e}")
             return False
     
+    def export_parquet(self, filepath: str):
+        """
+        Export session history to a zstd-compressed Parquet file (requires pyarrow).
+        
+        Written from the validated column arrays, so only the SESSION_COLUMNS
+        are kept, with fixed types: timestamp (datetime64[ns]), exercise_type
+        (dictionary-encoded), reps (int32), avg_form_score and duration
+        (float64). Extra session fields are dropped; use export_data to keep them.
+        
+        Args:
+            filepath: Path where to save the Parquet file
+        """
+        n = self._n
+        if n == 0:
+            return False
+        
+        # Codes are assigned 0, 1, 2, ... in first-seen order
+        exercise_types = pd.Categorical.from_codes(
+            self._types_arr[:n], categories=list(self._type_codes))
+        pd.DataFrame({
+            'timestamp': self._ts[:n],
+            'exercise_type': exercise_types,
+            'reps': self._reps[:n],
+            'avg_form_score': self._form[:n],
+            'duration': self._dur[:n],
+        }).to_parquet(filepath, engine='pyarrow', compression='zstd', index=False)
+        return True
+    
+    def import_parquet(self, filepath: str):
+        """
+        Import session history from a Parquet file written by export_parquet.
+        
+        Timestamps are stored as datetime64[ns], so no string parsing is needed.
+        
+        Args:
+            filepath: Path to the Parquet file
+        """
+        try:
+            imported_df = pd.read_parquet(filepath, engine='pyarrow')
+            self._extend_from_frame(imported_df)
+            return True
+        except Exception as e:
+            print(f"Error importing data: {e}")
+            return False
+    
+    def _extend_from_frame(self, imported_df: pd.DataFrame):
+        """
+        Append the rows of an imported DataFrame to the session history.
+        
+        Columns are validated and converted as whole arrays before anything
+        is stored, so a bad row leaves the history unchanged.
+        
+        Raises:
+            ValueError: If a column is missing or any row has missing or
+                invalid values
+        """
+        missing = [column for column in SESSION_COLUMNS if column not in imported_df]
+        if missing:
+            raise ValueError(f"Imported sessions lack columns {missing}")
+        if imported_df[SESSION_COLUMNS].isna().any(axis=None):
+            raise ValueError("Imported sessions have missing values")
+        
+        timestamps = pd.to_datetime(imported_df['timestamp'])
+        if timestamps.dt.tz is not None:
+            timestamps = timestamps.dt.tz_convert(None)
+        ts = timestamps.to_numpy(dtype='datetime64[ns]')
+        reps = pd.to_numeric(imported_df['reps']).to_numpy().astype(np.int64)
+        form = pd.to_numeric(imported_df['avg_form_score']).to_numpy(dtype=np.float64)
+        dur = pd.to_numeric(imported_df['duration']).to_numpy(dtype=np.float64)
+        codes, uniques = pd.factorize(imported_df['exercise_type'])
+        
+        self.sessions.extend(imported_df.to_dict('records'))
+        self._append_columns(ts, reps, form, dur, codes, list(uniques))
+        self._mark_changed()
+    
+    def _append_columns(self, ts: np.ndarray, reps: np.ndarray, form: np.ndarray,
+                        dur: np.ndarray, codes: np.ndarray, types: List[str]):
+        """
+        Bulk counterpart of _append_row: append converted columns with at
+        most one capacity grow, then update the running totals and recent
+        buffers once.
+        
+        Args:
+            ts, reps, form, dur: Converted column arrays of equal length
+            codes: Per-row index into types
+            types: Exercise types referenced by codes
+        """
+        k = len(ts)
+        if k == 0:
+            return
+        
+        n = self._n
+        self._reserve(n + k)
+        
+        # Map the import's own codes onto ours, registering new types
+        lookup = np.array([self._type_codes.setdefault(t, len(self._type_codes)) for t in types],
+                          dtype=self._types_arr.dtype)
+        
+        self._ts[n:n + k] = ts
+        self._reps[n:n + k] = reps
+        self._form[n:n + k] = form
+        self._dur[n:n + k] = dur
+        self._types_arr[n:n + k] = lookup[codes]
+        self._n = n + k
+        
+        self._total_reps += int(reps.sum())
+        self._total_duration += float(dur.sum())
+        self._form_sum += float(form.sum())
+        
+        # Only the last few rows overall and per type reach the ring buffers
+        for key, rows in [(None, np.arange(k))] + [
+                (t, np.flatnonzero(codes == i)) for i, t in enumerate(types)]:
+            if key not in self._recent:
+                self._recent[key] = (deque(maxlen=_RECENT_SESSIONS),
+                                     deque(maxlen=_RECENT_SESSIONS))
+            recent_form, recent_dur = self._recent[key]
+            tail = rows[-_RECENT_SESSIONS:]
+            recent_form.extend(form[tail].tolist())
+            recent_dur.extend(dur[tail].tolist())
+    
     def clear_history(self):
         """Clear all session history."""
         self.sessions = []
-        self.session_history = pd.DataFrame(columns=[
-            'timestamp', 'exercise_type', 'reps', 'avg_form_score', 'duration'
-        ])
\ No newline at end of file
+        self._df_cache = None
+        self._mark_changed()
+        self._reset_arrays()
\ No newline at end of file
@@ -1,7 +1,384 @@
 import cv2
 import mediapipe as mp
+import numpy as np
 import math
-from typing import List, Tuple, Optional
+import os
+import platform
+import queue
+import threading
+import time
+from typing import List, NamedTuple, Tuple, Optional
+
+from mediapipe.framework.formats import landmark_pb2
+
+# Optional TFLite interpreter for quantized pose models
+try:
+    import tflite_runtime.interpreter as tflite
+except ImportError:
+    try:
+        from tensorflow import lite as tflite
+    except ImportError:
+        tflite = None
+
+
+# Numba is optional; without it the angle kernels run as plain Python/NumPy
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+NUM_POSE_LANDMARKS = 33
+
+# Landmark tensor of the pose landmark models: 33 pose landmarks plus 6
+# auxiliary ones, each as (x, y, z, visibility, presence)
+_LANDMARK_TENSOR_SIZE = (NUM_POSE_LANDMARKS + 6) * 5
+
+# Landmarks below this visibility score are treated as not detected
+VISIBILITY_THRESHOLD = 0.5
+
+
+@njit(cache=True, fastmath=True)
+def _compute_angle(x1, y1, x2, y2, x3, y3):
+    """Angle at (x2, y2) in degrees, normalized to [0, 180]."""
+    angle = abs(math.degrees(math.atan2(y3 - y2, x3 - x2) -
+                             math.atan2(y1 - y2, x1 - x2)))
+    return 360.0 - angle if angle > 180.0 else angle
+
+
+@njit(cache=True)
+def _compute_angles(pts):
+    """
+    Batched _compute_angle over an (N, 3, 2) array of point triples.
+    
+    NaN coordinates propagate to a NaN angle, so fastmath is not used here.
+    """
+    out = np.empty(pts.shape[0], dtype=np.float64)
+    for i in range(pts.shape[0]):
+        angle = abs(math.degrees(
+            math.atan2(pts[i, 2, 1] - pts[i, 1, 1], pts[i, 2, 0] - pts[i, 1, 0]) -
+            math.atan2(pts[i, 0, 1] - pts[i, 1, 1], pts[i, 0, 0] - pts[i, 1, 0])
+        ))
+        out[i] = 360.0 - angle if angle > 180.0 else angle
+    return out
+
+
+class PoseResult(NamedTuple):
+    """Result container mirroring the ``pose_landmarks`` field of MediaPipe results."""
+    pose_landmarks: Optional[landmark_pb2.NormalizedLandmarkList]
+
+
+def _select_model_path(model_path: str) -> str:
+    """
+    Prefer an FP16 sibling of an INT8 model on x86, where INT8 kernels are slow.
+    
+    Args:
+        model_path: Path to the requested .tflite model
+        
+    Returns:
+        Path of the model that should actually be loaded
+    """
+    if platform.machine().lower() in ("x86_64", "amd64", "i386", "i686"):
+        head, name = os.path.split(model_path)
+        if "int8" in name:
+            fp16_path = os.path.join(head, name.replace("int8", "fp16"))
+            if os.path.exists(fp16_path):
+                return fp16_path
+    return model_path
+
+
+def _make_interpreter(model_path: str, num_threads: int):
+    """
+    Builds the fastest available interpreter for a pose model.
+    
+    Tries an Edge TPU compiled sibling (``<name>_edgetpu.tflite``) through
+    pycoral, then through the raw ``libedgetpu`` delegate, and finally falls
+    back to the CPU interpreter, which uses XNNPACK for FP32/FP16 graphs.
+    
+    Args:
+        model_path: Path to the requested .tflite model
+        num_threads: Threads for the CPU interpreter
+        
+    Returns:
+        Tuple of (interpreter, loaded model path, backend name)
+    """
+    root, ext = os.path.splitext(model_path)
+    edgetpu_path = model_path if root.endswith("_edgetpu") else f"{root}_edgetpu{ext}"
+
+    if os.path.exists(edgetpu_path):
+        try:
+            from pycoral.utils.edgetpu import make_interpreter
+            return make_interpreter(edgetpu_path), edgetpu_path, "edgetpu"
+        except (ImportError, ValueError, RuntimeError):
+            pass
+
+        load_delegate = getattr(tflite, "load_delegate", None)
+        if load_delegate is None:
+            load_delegate = tflite.experimental.load_delegate
+        try:
+            interpreter = tflite.Interpreter(
+                model_path=edgetpu_path,
+                experimental_delegates=[load_delegate('libedgetpu.so.1')]
+            )
+            return interpreter, edgetpu_path, "edgetpu"
+        except (ValueError, OSError, RuntimeError):
+            pass
+
+    if root.endswith("_edgetpu"):
+        model_path = root[:-len("_edgetpu")] + ext
+    model_path = _select_model_path(model_path)
+    return tflite.Interpreter(model_path=model_path, num_threads=num_threads), model_path, "xnnpack"
+
+
+class TFLitePose:
+    """
+    Drop-in replacement for ``mp.solutions.pose.Pose`` that runs a quantized
+    (INT8/FP16) pose landmark model directly through the TFLite interpreter.
+    """
+
+    def __init__(self,
+                 model_path: str,
+                 min_detection_confidence: float = 0.5,
+                 num_threads: Optional[int] = None):
+        """
+        Loads the pose landmark model and allocates its tensors.
+        
+        Args:
+            model_path: Path to the quantized pose landmark .tflite model
+            min_detection_confidence: Minimum pose presence score [0.0, 1.0]
+            num_threads: Interpreter threads (defaults to half the CPU cores)
+        
+        An Edge TPU compiled sibling of the model is used when present and a
+        TPU is attached; see _make_interpreter.
+        """
+        if tflite is None:
+            raise ImportError("TFLitePose requires tflite_runtime or tensorflow")
+
+        if num_threads is None:
+            num_threads = max(1, (os.cpu_count() or 2) // 2)
+
+        self.min_detection_confidence = min_detection_confidence
+        self.interpreter, self.model_path, self.backend = _make_interpreter(
+            model_path, num_threads)
+        self.interpreter.allocate_tensors()
+
+        self._input = self.interpreter.get_input_details()[0]
+        self.input_height, self.input_width = self._input['shape'][1:3]
+
+        # The landmark models also emit a segmentation mask, a heatmap and
+        # world landmarks, so pick the two outputs we need by shape
+        outputs = self.interpreter.get_output_details()
+        self._landmark_output = self._find_output(
+            outputs, lambda shape: shape[-1] == _LANDMARK_TENSOR_SIZE, "landmark")
+        self._flag_output = self._find_output(
+            outputs, lambda shape: int(np.prod(shape)) == 1, "pose flag")
+
+        # Run once on a blank frame and decode its landmarks so an
+        # incompatible model fails here, not in the middle of a session
+        self._invoke(np.zeros((self.input_height, self.input_width, 3), np.uint8))
+        self._read_landmarks()
+
+    @staticmethod
+    def _find_output(outputs, matches, name: str):
+        """Return the first output tensor whose shape satisfies matches()."""
+        for detail in outputs:
+            if matches(tuple(detail['shape'])):
+                return detail
+        shapes = [tuple(d['shape']) for d in outputs]
+        raise ValueError(f"No {name} output found in pose model outputs {shapes}")
+
+    @staticmethod
+    def _dequantize(detail, value: np.ndarray) -> np.ndarray:
+        """Convert a (possibly quantized) output tensor to float32."""
+        scale, zero_point = detail['quantization']
+        if scale:
+            return (value.astype(np.float32) - zero_point) * scale
+        return value.astype(np.float32)
+
+    def _invoke(self, imgRGB):
+        """Resize and quantize an RGB image into the input tensor and run the model."""
+        img = cv2.resize(imgRGB, (self.input_width, self.input_height),
+                         interpolation=cv2.INTER_LINEAR)
+
+        dtype = self._input['dtype']
+        if dtype == np.uint8:
+            tensor = img[np.newaxis]
+        else:
+            tensor = img[np.newaxis].astype(np.float32) / 255.0
+            scale, zero_point = self._input['quantization']
+            if dtype == np.int8 and scale:
+                tensor = np.clip(np.round(tensor / scale + zero_point), -128, 127).astype(np.int8)
+
+        self.interpreter.set_tensor(self._input['index'], tensor)
+        self.interpreter.invoke()
+
+    def _read_landmarks(self) -> np.ndarray:
+        """Dequantized (33, 5) landmark rows of the last invocation."""
+        raw = self._dequantize(
+            self._landmark_output, self.interpreter.get_tensor(self._landmark_output['index']))
+        return raw.reshape(-1, 5)[:NUM_POSE_LANDMARKS]
+
+    def process(self, imgRGB) -> PoseResult:
+        """
+        Runs the landmark model on an RGB image.
+        
+        Args:
+            imgRGB: Input RGB image (numpy array)
+            
+        Returns:
+            PoseResult whose landmarks are normalized to [0, 1]
+        """
+        self._invoke(imgRGB)
+
+        flag = self._dequantize(
+            self._flag_output, self.interpreter.get_tensor(self._flag_output['index']))
+        if float(flag.ravel()[0]) < self.min_detection_confidence:
+            return PoseResult(pose_landmarks=None)
+
+        raw = self._read_landmarks()
+
+        # Landmarks come back in input-pixel units with visibility as a logit
+        landmarks = landmark_pb2.NormalizedLandmarkList()
+        for x, y, z, visibility, _ in raw:
+            landmarks.landmark.add(
+                x=float(x) / self.input_width,
+                y=float(y) / self.input_height,
+                z=float(z) / self.input_width,
+                visibility=float(1.0 / (1.0 + np.exp(-visibility)))
+            )
+
+        return PoseResult(pose_landmarks=landmarks)
+
+    def close(self):
+        """Release the interpreter."""
+        self.interpreter = None
+
+
+class LandmarkerPose:
+    """
+    Drop-in replacement for ``mp.solutions.pose.Pose`` backed by the MediaPipe
+    Tasks ``PoseLandmarker``, which can run the model on the GPU delegate.
+    """
+
+    def __init__(self,
+                 model_asset_path: str,
+                 use_gpu: bool = True,
+                 static_image_mode: bool = False,
+                 min_detection_confidence: float = 0.5,
+                 min_tracking_confidence: float = 0.5):
+        """
+        Creates the pose landmarker.
+        
+        Args:
+            model_asset_path: Path to a ``pose_landmarker_*.task`` model bundle
+            use_gpu: Run inference on the GPU delegate instead of the CPU
+            static_image_mode: Detect on every image independently instead
+                of tracking across video frames
+            min_detection_confidence: Minimum pose detection score [0.0, 1.0]
+            min_tracking_confidence: Minimum pose tracking score [0.0, 1.0]
+        """
+        from mediapipe.tasks import python as mp_tasks
+        from mediapipe.tasks.python import vision
+
+        delegate = (mp_tasks.BaseOptions.Delegate.GPU if use_gpu
+                    else mp_tasks.BaseOptions.Delegate.CPU)
+        self.static_image_mode = static_image_mode
+        options = vision.PoseLandmarkerOptions(
+            base_options=mp_tasks.BaseOptions(model_asset_path=model_asset_path,
+                                              delegate=delegate),
+            running_mode=(vision.RunningMode.IMAGE if static_image_mode
+                          else vision.RunningMode.VIDEO),
+            num_poses=1,
+            min_pose_detection_confidence=min_detection_confidence,
+            min_pose_presence_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence
+        )
+        self.landmarker = vision.PoseLandmarker.create_from_options(options)
+        self._timestamp_ms = -1
+
+    def process(self, imgRGB) -> PoseResult:
+        """
+        Runs the landmarker on an RGB image.
+        
+        Args:
+            imgRGB: Input RGB image (contiguous uint8 numpy array)
+            
+        Returns:
+            PoseResult whose landmarks are normalized to [0, 1]
+        """
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=imgRGB)
+        if self.static_image_mode:
+            result = self.landmarker.detect(image)
+        else:
+            # Video mode requires strictly increasing timestamps
+            self._timestamp_ms = max(self._timestamp_ms + 1, time.monotonic_ns() // 1_000_000)
+            result = self.landmarker.detect_for_video(image, self._timestamp_ms)
+
+        if not result.pose_landmarks:
+            return PoseResult(pose_landmarks=None)
+
+        landmarks = landmark_pb2.NormalizedLandmarkList()
+        for lm in result.pose_landmarks[0]:
+            landmarks.landmark.add(
+                x=lm.x, y=lm.y, z=lm.z,
+                visibility=lm.visibility if lm.visibility is not None else 0.0
+            )
+        return PoseResult(pose_landmarks=landmarks)
+
+    def close(self):
+        """Release the landmarker."""
+        if self.landmarker is not None:
+            self.landmarker.close()
+            self.landmarker = None
+
+
+def quantize_pose_model(saved_model_dir: str,
+                        calibration_frames,
+                        output_path: str,
+                        full_integer: bool = True,
+                        input_size: int = 256) -> str:
+    """
+    Converts a pose landmark SavedModel into an INT8 or FP16 .tflite model.
+    
+    Requires TensorFlow; intended to be run offline, not in the webcam loop.
+    
+    Args:
+        saved_model_dir: Directory containing the FP32 SavedModel
+        calibration_frames: Iterable of BGR frames (~100) for INT8 calibration
+        output_path: Where to write the converted model
+        full_integer: INT8 full-integer quantization if True, otherwise FP16
+        input_size: Square model input resolution
+        
+    Returns:
+        The output path
+    """
+    import tensorflow as tf
+
+    converter = tf.lite.TFLiteConverter.from_saved_model(saved_model_dir)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+
+    if full_integer:
+        def representative_dataset():
+            for frame in calibration_frames:
+                rgb = cv2.cvtColor(cv2.resize(frame, (input_size, input_size)),
+                                   cv2.COLOR_BGR2RGB)
+                yield [rgb[np.newaxis].astype(np.float32) / 255.0]
+
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        converter.inference_input_type = tf.uint8
+    else:
+        converter.target_spec.supported_types = [tf.float16]
+
+    with open(output_path, "wb") as f:
+        f.write(converter.convert())
+    return output_path
 
 
 class PoseDetector:
@@ -10,6 +387,12 @@ class PoseDetector:
     Provides key landmark detection, angle calculation, and visualization utilities.
     """
 
+    # BGR colours and font for the angle overlay
+    _COLOR_LINE = (255, 255, 255)
+    _COLOR_PT = (0, 0, 255)
+    _COLOR_TXT = (0, 255, 0)
+    _FONT = cv2.FONT_HERSHEY_SIMPLEX
+
     def __init__(self,
                  mode: bool = False,
                  complexity: int = 1,
@@ -17,7 +400,13 @@ class PoseDetector:
                  enable_segmentation: bool = False,
                  smooth_segmentation: bool = True,
                  detection_confidence: float = 0.5,
-                 tracking_confidence: float = 0.5):
+                 tracking_confidence: float = 0.5,
+                 model_path: Optional[str] = None,
+                 num_threads: Optional[int] = None,
+                 infer_size: Optional[Tuple[int, int]] = (640, 480),
+                 use_gpu: bool = False,
+                 landmarker_path: Optional[str] = None,
+                 motion_threshold: Optional[float] = None):
         """
         Initializes the MediaPipe Pose model and drawing utilities.
         
@@ -29,6 +418,19 @@ class PoseDetector:
             smooth_segmentation: Whether to filter segmentation to reduce jitter
             detection_confidence: Minimum confidence for pose detection [0.0, 1.0]
             tracking_confidence: Minimum confidence for pose tracking [0.0, 1.0]
+            model_path: Optional quantized .tflite landmark model; when given,
+                inference runs through TFLitePose instead of MediaPipe Pose
+            num_threads: Interpreter threads for the TFLite backend
+            infer_size: (width, height) box frames are downscaled to fit
+                before inference, keeping their aspect ratio; frames that
+                already fit are used as-is. None runs on the full frame
+            use_gpu: Run inference through LandmarkerPose on the GPU delegate
+            landmarker_path: ``pose_landmarker_*.task`` bundle, required
+                when use_gpu is True
+            motion_threshold: Opt-in mean absolute pixel difference (0-255)
+                of a 64x36 thumbnail below which a video frame counts as
+                unchanged and the previous results are reused. Ignored when
+                mode is True; None (default) always runs inference
         """
         self.mode = mode
         self.complexity = complexity
@@ -37,11 +439,80 @@ class PoseDetector:
         self.smooth_segmentation = smooth_segmentation
         self.detection_confidence = detection_confidence
         self.tracking_confidence = tracking_confidence
-
-        # Initialize MediaPipe pose and drawing utils
+        self.model_path = model_path
+        self.infer_size = infer_size
+        self.use_gpu = use_gpu
+        self.motion_threshold = motion_threshold
+
+        self.num_threads = num_threads
+        self.landmarker_path = landmarker_path
+        if self.use_gpu and not self.landmarker_path:
+            raise ValueError("use_gpu requires landmarker_path (a .task model bundle)")
+
+        # The model itself loads lazily, but a wrong path should fail now
+        for path in (self.landmarker_path if self.use_gpu else None, self.model_path):
+            if path and not os.path.exists(path):
+                raise FileNotFoundError(f"Pose model not found: {path}")
+
+        # Drawing utils are cheap; the pose model is loaded on first use
         self.mpDraw = mp.solutions.drawing_utils
         self.mpPose = mp.solutions.pose
-        self.pose = self.mpPose.Pose(
+        self._pose = None
+        self._pose_lock = threading.Lock()
+        self.results = None
+        self.lmList: List[List[int]] = []
+        # Raw normalized x, y and visibility of all landmarks from the last frame
+        self.lm_array: Optional[np.ndarray] = None
+        # O(1) lookup by landmark index: integer pixel coordinates plus a
+        # visibility mask (no sentinel, off-frame coordinates can be negative)
+        self._lm_xy = np.zeros((NUM_POSE_LANDMARKS, 2), dtype=np.int32)
+        self._visible = np.zeros(NUM_POSE_LANDMARKS, dtype=bool)
+        self._rgb_buf = None
+        # Thumbnail and results of the last frame inference actually ran on
+        self._last_small = None
+        self._last_results = None
+        # Pixel coordinates of all landmarks, NaN where not visible
+        self.lm = np.full((NUM_POSE_LANDMARKS, 2), np.nan, dtype=np.float32)
+
+    @property
+    def pose(self):
+        """Pose backend, created on first access so idle detectors stay cheap."""
+        if self._pose is None:
+            with self._pose_lock:
+                if self._pose is None:
+                    self._pose = self._create_pose()
+        return self._pose
+
+    def load(self) -> "PoseDetector":
+        """
+        Load the pose model now instead of on the first frame.
+        
+        Model loading and the backend's own checks (e.g. TFLitePose's test
+        inference) then fail here, before a capture session starts.
+        
+        Returns:
+            self, for chaining
+        """
+        _ = self.pose
+        return self
+
+    def _create_pose(self):
+        """Build the configured pose backend (GPU landmarker, TFLite or MediaPipe)."""
+        if self.use_gpu:
+            return LandmarkerPose(
+                self.landmarker_path,
+                use_gpu=True,
+                static_image_mode=self.mode,
+                min_detection_confidence=self.detection_confidence,
+                min_tracking_confidence=self.tracking_confidence
+            )
+        if self.model_path:
+            return TFLitePose(
+                self.model_path,
+                min_detection_confidence=self.detection_confidence,
+                num_threads=self.num_threads
+            )
+        return self.mpPose.Pose(
             static_image_mode=self.mode,
             model_complexity=self.complexity,
             smooth_landmarks=self.smooth_landmarks,
@@ -50,25 +521,66 @@ class PoseDetector:
             min_detection_confidence=self.detection_confidence,
             min_tracking_confidence=self.tracking_confidence
         )
-        self.results = None
-        self.lmList: List[List[int]] = []
 
-    def find_pose(self, img, draw: bool = True):
+    def infer(self, img):
+        """
+        Runs pose inference on a BGR image without updating self.results.
+        
+        Safe to call from a worker thread while another thread draws with
+        find_pose(img, results=...): it only touches the RGB scratch buffer
+        and the motion-gate cache (_last_small, _last_results), never
+        self.results or the landmark arrays. Not safe to call from two
+        threads at once.
+        
+        Args:
+            img: Input BGR image (numpy array)
+            
+        Returns:
+            Pose results object with a ``pose_landmarks`` field
+        """
+        # Reuse the previous results when the frame barely differs from the
+        # last one inference ran on (e.g. the user is holding still)
+        if self.motion_threshold is not None and not self.mode:
+            thumb = cv2.resize(img, (64, 36), interpolation=cv2.INTER_AREA)
+            if (self._last_results is not None
+                    and cv2.absdiff(thumb, self._last_small).mean() < self.motion_threshold):
+                return self._last_results
+            self._last_small = thumb
+
+        # Downscale into infer_size before colour conversion; landmarks are
+        # normalized so they still map onto the full-size frame
+        small = img
+        if self.infer_size is not None:
+            h, w = img.shape[:2]
+            scale = min(self.infer_size[0] / w, self.infer_size[1] / h)
+            if scale < 1.0:
+                size = (max(1, round(w * scale)), max(1, round(h * scale)))
+                small = cv2.resize(img, size, interpolation=cv2.INTER_AREA)
+
+        # Convert into a reused scratch buffer instead of a fresh allocation
+        if self._rgb_buf is None or self._rgb_buf.shape != small.shape:
+            self._rgb_buf = np.empty_like(small)
+        cv2.cvtColor(small, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+        self._last_results = self.pose.process(self._rgb_buf)
+        return self._last_results
+
+    def find_pose(self, img, draw: bool = True, results=None):
         """
         Detects pose landmarks in a given image.
         
         Args:
             img: Input BGR image (numpy array)
             draw: Whether to draw the detected landmarks
+            results: Precomputed results for img (e.g. from infer() on a
+                worker thread); inference is skipped when given
             
         Returns:
             Processed image with landmarks drawn (if draw=True)
         """
         if img is None or img.size == 0:
             return img
-            
-        imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        self.results = self.pose.process(imgRGB)
+
+        self.results = results if results is not None else self.infer(img)
 
         if self.results.pose_landmarks and draw:
             self.mpDraw.draw_landmarks(
@@ -91,21 +603,34 @@ class PoseDetector:
             List of [id, x, y] for each detected landmark
         """
         self.lmList = []
+        self.lm = np.full((NUM_POSE_LANDMARKS, 2), np.nan, dtype=np.float32)
+        self.lm_array = None
+        self._visible[:] = False
         
         if img is None or img.size == 0:
             return self.lmList
             
         if self.results and self.results.pose_landmarks:
             h, w, c = img.shape
-            for id, lm in enumerate(self.results.pose_landmarks.landmark):
-                # Check visibility threshold
-                if lm.visibility < 0.5:
-                    continue
-                    
-                cx, cy = int(lm.x * w), int(lm.y * h)
-                self.lmList.append([id, cx, cy])
-                
-                if draw:
+
+            # Copy all landmarks into one (33, 3) array of x, y, visibility
+            self.lm_array = np.array(
+                [(lm.x, lm.y, lm.visibility) for lm in self.results.pose_landmarks.landmark],
+                dtype=np.float32
+            )
+
+            # Check visibility threshold for all landmarks in one compare,
+            # written straight into the lookup mask, then scale to pixels
+            np.greater_equal(self.lm_array[:, 2], VISIBILITY_THRESHOLD, out=self._visible)
+            ids = np.flatnonzero(self._visible)
+            xy = (self.lm_array[ids, :2] * np.array([w, h], dtype=np.float32)).astype(np.int32)
+
+            self.lm[ids] = xy
+            self._lm_xy[ids] = xy
+            self.lmList = np.column_stack((ids, xy)).tolist()
+
+            if draw:
+                for cx, cy in xy.tolist():
                     cv2.circle(img, (cx, cy), 5, (0, 0, 255), cv2.FILLED)
 
         return self.lmList
@@ -122,44 +647,101 @@ class PoseDetector:
         Returns:
             Calculated angle in degrees, or None if landmarks not found
         """
-        # Validate landmarks exist
-        if len(self.lmList) == 0:
-            return None
-            
-        # Find the landmarks in lmList
-        landmarks = {lm[0]: lm[1:] for lm in self.lmList}
-        
-        if p1 not in landmarks or p2 not in landmarks or p3 not in landmarks:
+        # Validate landmarks exist (direct index into the lookup arrays)
+        idx = [p1, p2, p3]
+        if not all(0 <= p < NUM_POSE_LANDMARKS for p in idx) or not self._visible[idx].all():
             return None
 
-        x1, y1 = landmarks[p1]
-        x2, y2 = landmarks[p2]
-        x3, y3 = landmarks[p3]
-
-        # Calculate the angle using atan2
-        angle = math.degrees(
-            math.atan2(y3 - y2, x3 - x2) -
-            math.atan2(y1 - y2, x1 - x2)
-        )
+        pts = self._lm_xy[idx]
+        (x1, y1), (x2, y2), (x3, y3) = pts.tolist()
 
-        # Normalize the angle to [0, 180]
-        angle = abs(angle)
-        if angle > 180:
-            angle = 360 - angle
+        # Calculate the angle using atan2, normalized to [0, 180]
+        angle = _compute_angle(x1, y1, x2, y2, x3, y3)
 
         # Draw visual elements
         if draw:
-            cv2.line(img, (x1, y1), (x2, y2), (255, 255, 255), 3)
-            cv2.line(img, (x3, y3), (x2, y2), (255, 255, 255), 3)
+            self._draw_angle(img, pts, angle)
 
-            for x, y in [(x1, y1), (x2, y2), (x3, y3)]:
-                cv2.circle(img, (x, y), 6, (0, 0, 255), cv2.FILLED)
-                cv2.circle(img, (x, y), 12, (0, 0, 255), 2)
+        return angle
+
+    def find_angles_batch(self, triples, lm: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Calculates several joint angles at once from the last find_positions call.
+        
+        Args:
+            triples: (N, 3) array-like of landmark indices (a, b, c), b is the vertex
+            lm: Optional (33, 2) landmark array to use instead of self.lm
+            
+        Returns:
+            Array of N angles in degrees within [0, 180], NaN where a landmark is missing
+        """
+        if lm is None:
+            lm = self.lm
+        P = lm[np.asarray(triples, dtype=np.intp)]  # (N, 3, 2)
+        if NUMBA_AVAILABLE:
+            return _compute_angles(P)
+
+        angles = np.abs(np.degrees(
+            np.arctan2(P[:, 2, 1] - P[:, 1, 1], P[:, 2, 0] - P[:, 1, 0]) -
+            np.arctan2(P[:, 0, 1] - P[:, 1, 1], P[:, 0, 0] - P[:, 1, 0])
+        ))
+        return np.where(angles > 180, 360 - angles, angles)
+
+    def draw_landmarks(self, img, lm: Optional[np.ndarray] = None):
+        """
+        Draws the pose skeleton from a pixel landmark array.
+        
+        Args:
+            img: Image to draw on
+            lm: Optional (33, 2) landmark array to use instead of self.lm;
+                landmarks that are NaN are skipped
+        """
+        if lm is None:
+            lm = self.lm
+        visible = ~np.isnan(lm).any(axis=1)
+        pts = np.where(visible[:, None], lm, 0).astype(int).tolist()
 
-            cv2.putText(img, f"{int(angle)}°", (x2 - 50, y2 + 50),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 255, 0), 2)
+        for a, b in self.mpPose.POSE_CONNECTIONS:
+            if visible[a] and visible[b]:
+                cv2.line(img, tuple(pts[a]), tuple(pts[b]), (224, 224, 224), 2)
 
-        return angle
+        for idx in np.flatnonzero(visible):
+            cv2.circle(img, tuple(pts[idx]), 2, (0, 0, 255), 2)
+
+    def draw_angle(self, img, p1: int, p2: int, p3: int, angle: float):
+        """
+        Visualizes an angle computed by find_angles_batch.
+        
+        Args:
+            img: Image to draw on
+            p1, p2, p3: Landmark indices (p2 is the vertex)
+            angle: Angle in degrees
+        """
+        pts = self.lm[[p1, p2, p3]]
+        if np.isnan(pts).any() or np.isnan(angle):
+            return
+        self._draw_angle(img, pts.astype(np.int32), angle)
+
+    @classmethod
+    def _draw_angle(cls, img, pts: np.ndarray, angle: float):
+        """
+        Draw the two limb segments, joint markers, and angle label.
+        
+        Args:
+            img: Image to draw on
+            pts: (3, 2) int32 pixel coordinates, the vertex in the middle
+            angle: Angle in degrees
+        """
+        # Both segments as one open polyline through the vertex
+        cv2.polylines(img, [pts], False, cls._COLOR_LINE, 3)
+
+        for x, y in pts.tolist():
+            cv2.circle(img, (x, y), 6, cls._COLOR_PT, cv2.FILLED)
+            cv2.circle(img, (x, y), 12, cls._COLOR_PT, 2)
+
+        x2, y2 = pts[1].tolist()
+        cv2.putText(img, f"{int(angle)}°", (x2 - 50, y2 + 50),
+                    cls._FONT, 0.9, cls._COLOR_TXT, 2)
 
     def get_landmark_position(self, landmark_id: int) -> Optional[Tuple[int, int]]:
         """
@@ -171,9 +753,9 @@ class PoseDetector:
         Returns:
             Tuple of (x, y) coordinates, or None if not found
         """
-        for lm in self.lmList:
-            if lm[0] == landmark_id:
-                return (lm[1], lm[2])
+        if 0 <= landmark_id < NUM_POSE_LANDMARKS and self._visible[landmark_id]:
+            x, y = self._lm_xy[landmark_id].tolist()
+            return (x, y)
         return None
 
     def is_pose_detected(self) -> bool:
@@ -181,9 +763,11 @@ class PoseDetector:
         return self.results is not None and self.results.pose_landmarks is not None
 
     def close(self):
-        """Release MediaPipe resources."""
-        if self.pose:
-            self.pose.close()
+        """Release MediaPipe resources, if the model was ever loaded."""
+        with self._pose_lock:
+            if self._pose is not None:
+                self._pose.close()
+                self._pose = None
 
     def __enter__(self):
         """Context manager entry."""
@@ -194,10 +778,48 @@ class PoseDetector:
         self.close()
 
 
+def put_latest(q: queue.Queue, item):
+    """Put item into a size-1 queue, replacing whatever stale item is there."""
+    try:
+        q.get_nowait()
+    except queue.Empty:
+        pass
+    q.put(item)
+
+
+def capture_latest(cap, frames: queue.Queue, stop_event: threading.Event, transform=None):
+    """
+    Read frames from a cv2.VideoCapture into a size-1 queue, keeping only the newest.
+    
+    Meant to run on a background thread: the consumer never waits on the
+    camera when it keeps up and never works on a stale frame when it falls
+    behind. A None in the queue signals that the camera stopped delivering
+    frames.
+    
+    Args:
+        cap: Opened cv2.VideoCapture
+        frames: Queue(maxsize=1) the frames are put into
+        stop_event: Set to stop the loop
+        transform: Optional function applied to each frame on this thread
+            (e.g. mirroring)
+    """
+    while not stop_event.is_set():
+        success, frame = cap.read()
+        if success and transform is not None:
+            frame = transform(frame)
+        put_latest(frames, frame if success else None)
+        if not success:
+            break
+
+
 def main():
     """
     Simple webcam test to verify pose detection works.
     Press 'q' to quit.
+    
+    Capture, inference and drawing run on separate threads connected by
+    size-1 queues that always hold the newest item, so throughput tracks the
+    slowest stage rather than the sum of all three.
     """
     with PoseDetector(detection_confidence=0.7, tracking_confidence=0.7) as detector:
         cap = cv2.VideoCapture(0)
@@ -206,36 +828,75 @@ def main():
             print("Error: Could not open webcam")
             return
 
+        # Compressed MJPG payload and a one-frame driver buffer keep capture
+        # latency low; 640x480 matches the default inference size
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+
         print("Press 'q' to quit")
 
-        while cap.isOpened():
-            success, img = cap.read()
-            if not success:
-                print("Failed to read frame")
-                break
-
-            # Detect pose
-            img = detector.find_pose(img)
-            lmList = detector.find_positions(img, draw=True)
-
-            # Example: Calculate elbow angle if landmarks detected
-            if len(lmList) > 0:
-                # Right arm: shoulder(12), elbow(14), wrist(16)
-                angle = detector.find_angle(img, 12, 14, 16, draw=True)
-                if angle:
-                    # Display FPS and detection status
-                    cv2.putText(img, f"Right Elbow: {int(angle)}°", 
-                               (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 
-                               0.7, (255, 0, 0), 2)
-
-            cv2.imshow("Pose Detection", img)
-            
-            if cv2.waitKey(10) & 0xFF == ord('q'):
-                break
+        frames = queue.Queue(maxsize=1)
+        results = queue.Queue(maxsize=1)
+        stop = threading.Event()
 
-        cap.release()
-        cv2.destroyAllWindows()
+        def inference():
+            # MediaPipe releases the GIL while the graph runs
+            while not stop.is_set():
+                try:
+                    img = frames.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if img is None:
+                    put_latest(results, None)
+                    break
+                put_latest(results, (img, detector.infer(img)))
+
+        workers = [threading.Thread(target=capture_latest, args=(cap, frames, stop), daemon=True),
+                   threading.Thread(target=inference, daemon=True)]
+        for worker in workers:
+            worker.start()
+
+        try:
+            while True:
+                try:
+                    item = results.get(timeout=0.1)
+                except queue.Empty:
+                    if cv2.waitKey(1) & 0xFF == ord('q'):
+                        break
+                    continue
+
+                if item is None:
+                    print("Failed to read frame")
+                    break
+
+                # Draw the pose detected on this frame
+                img, pose_results = item
+                img = detector.find_pose(img, results=pose_results)
+                lmList = detector.find_positions(img, draw=True)
+
+                # Example: Calculate elbow angle if landmarks detected
+                if len(lmList) > 0:
+                    # Right arm: shoulder(12), elbow(14), wrist(16)
+                    angle = detector.find_angle(img, 12, 14, 16, draw=True)
+                    if angle:
+                        # Display FPS and detection status
+                        cv2.putText(img, f"Right Elbow: {int(angle)}°", 
+                                   (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 
+                                   0.7, (255, 0, 0), 2)
+
+                cv2.imshow("Pose Detection", img)
+                
+                if cv2.waitKey(10) & 0xFF == ord('q'):
+                    break
+        finally:
+            stop.set()
+            for worker in workers:
+                worker.join(timeout=1.0)
+            cap.release()
+            cv2.destroyAllWindows()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()